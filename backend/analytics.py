@@ -0,0 +1,171 @@
+"""Per-role productivity/rating summaries behind /analytics.
+
+The histograms are kept in step with the productivity table by every write
+path, in the same transaction. Productivity is an integer 0-100, so its
+histogram gives exact averages and percentiles; ratings are bucketed by
+whole star (-1 = unrated) with a running sum for the average.
+
+Nothing here needs Flask: functions take a DB-API cursor, so they can be
+exercised against a stand-in cursor.
+"""
+import math
+from collections import Counter, defaultdict
+
+PERCENTILES = (50, 90, 99)
+RATING_DECIMALS = 2
+RATING_BUCKET_SQL = "IF(rating IS NULL, -1, LEAST(5, GREATEST(0, FLOOR(rating))))"
+
+SUMMARY_SQL = {
+    "productivity": "SELECT role, productivity, employees FROM role_productivity_hist WHERE employees > 0",
+    "rating": "SELECT role, rating_bucket, employees, rating_sum FROM role_rating_hist WHERE employees > 0",
+}
+SCAN_SQL = {
+    "productivity": """
+        SELECT COALESCE(role, ''), COALESCE(productivity, 0), COUNT(*)
+        FROM productivity GROUP BY 1, 2
+    """,
+    "rating": f"""
+        SELECT COALESCE(role, ''), {RATING_BUCKET_SQL}, COUNT(*), COALESCE(SUM(rating), 0)
+        FROM productivity GROUP BY 1, 2
+    """,
+}
+
+
+def normalize_rating(rating):
+    """Round a rating to what the FLOAT column stores and reads back.
+
+    A 32-bit FLOAT can't hold e.g. 2.99999999 and stores 3.0, so bucketing
+    the request's double would count the row in a different bucket than
+    the stored value it is later removed with. Rounded to two decimals, a
+    rating keeps its whole-star bucket through the FLOAT round trip.
+    """
+    if rating is None:
+        return None
+    return round(float(rating), RATING_DECIMALS)
+
+
+def rating_bucket(rating):
+    if rating is None:
+        return -1
+    return max(0, min(5, math.floor(rating)))
+
+
+def apply_summary_delta(cursor, removed=(), added=()):
+    """Fold removed and added (role, productivity, rating) rows into the summaries.
+
+    Call on the cursor of the transaction that writes the rows, before its
+    commit, so the data and its summary can never diverge.
+    """
+    productivity_delta = Counter()
+    rating_delta = Counter()
+    rating_sum_delta = Counter()
+    for sign, rows in ((-1, removed), (1, added)):
+        for role, productivity, rating in rows:
+            role = role or ""
+            productivity_delta[(role, productivity or 0)] += sign
+            bucket = rating_bucket(rating)
+            rating_delta[(role, bucket)] += sign
+            rating_sum_delta[(role, bucket)] += sign * (rating or 0)
+
+    # Sorted by primary key so concurrent writers lock histogram rows in the
+    # same order and can't deadlock each other
+    productivity_rows = [(r, p, n) for (r, p), n in sorted(productivity_delta.items()) if n]
+    rating_rows = [
+        (r, b, n, rating_sum_delta[(r, b)])
+        for (r, b), n in sorted(rating_delta.items()) if n or rating_sum_delta[(r, b)]
+    ]
+    if productivity_rows:
+        cursor.executemany("""
+            INSERT INTO role_productivity_hist (role, productivity, employees)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE employees = employees + VALUES(employees)
+        """, productivity_rows)
+    if rating_rows:
+        cursor.executemany("""
+            INSERT INTO role_rating_hist (role, rating_bucket, employees, rating_sum)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE employees = employees + VALUES(employees),
+                                    rating_sum = rating_sum + VALUES(rating_sum)
+        """, rating_rows)
+
+
+def rebuild_summaries(cursor):
+    """Recompute the summaries from a full scan, e.g. after a raw SQL load."""
+    cursor.execute("DELETE FROM role_productivity_hist")
+    cursor.execute("DELETE FROM role_rating_hist")
+    cursor.execute("INSERT INTO role_productivity_hist (role, productivity, employees) " + SCAN_SQL["productivity"])
+    cursor.execute("INSERT INTO role_rating_hist (role, rating_bucket, employees, rating_sum) " + SCAN_SQL["rating"])
+
+
+def load_histograms(cursor, source=SUMMARY_SQL):
+    """Read histogram rows from the summaries or, given SCAN_SQL, from the table."""
+    cursor.execute(source["productivity"])
+    productivity_rows = cursor.fetchall()
+    cursor.execute(source["rating"])
+    rating_rows = cursor.fetchall()
+    return productivity_rows, rating_rows
+
+
+def histogram_stats(productivity_hist, rating_hist, rating_sum):
+    employees = sum(productivity_hist.values())
+    rated = sum(n for b, n in rating_hist.items() if b >= 0)
+    stats = {
+        "employees": employees,
+        "avg_productivity": None,
+        "percentiles": {f"p{p}": None for p in PERCENTILES},
+        "avg_rating": round(rating_sum / rated, 2) if rated else None,
+        "rating_distribution": {
+            ("unrated" if b < 0 else str(b)): rating_hist.get(b, 0) for b in range(-1, 6)
+        },
+    }
+    if not employees:
+        return stats
+
+    stats["avg_productivity"] = round(sum(p * n for p, n in productivity_hist.items()) / employees, 2)
+    # Nearest-rank percentiles over the sorted histogram
+    targets = [(p, math.ceil(p / 100 * employees)) for p in PERCENTILES]
+    seen = 0
+    for value in sorted(productivity_hist):
+        seen += productivity_hist[value]
+        while targets and seen >= targets[0][1]:
+            stats["percentiles"][f"p{targets.pop(0)[0]}"] = value
+    return stats
+
+
+def summarize(productivity_rows, rating_rows):
+    productivity_hist = defaultdict(Counter)
+    rating_hist = defaultdict(Counter)
+    rating_sums = Counter()
+    for role, productivity, employees in productivity_rows:
+        productivity_hist[role][productivity] += employees
+    for role, bucket, employees, rating_sum in rating_rows:
+        rating_hist[role][bucket] += employees
+        rating_sums[role] += rating_sum
+
+    overall_productivity, overall_rating = Counter(), Counter()
+    roles = []
+    for role in sorted(set(productivity_hist) | set(rating_hist)):
+        overall_productivity.update(productivity_hist[role])
+        overall_rating.update(rating_hist[role])
+        stats = histogram_stats(productivity_hist[role], rating_hist[role], rating_sums[role])
+        if stats["employees"]:
+            roles.append({"role": role, **stats})
+
+    return {
+        "overall": histogram_stats(overall_productivity, overall_rating, sum(rating_sums.values())),
+        "roles": roles,
+    }
+
+
+def bulk_update_delta(rows, old):
+    """Summary delta for one bulk-update chunk.
+
+    `rows` are (name, role, feedback, rating, id) in the order executemany
+    applies them, so the last row per id is what ends up stored; `old` maps
+    each existing id to its (role, productivity, rating) before the update.
+    Productivity is not updatable and carries over from the old row.
+    """
+    final = {r[4]: r for r in rows}
+    removed = list(old.values())
+    added = [(final[i][1], prev[1], final[i][3]) for i, prev in old.items()]
+    return removed, added
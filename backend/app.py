@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_jwt_extended import (
     JWTManager, create_access_token, jwt_required,
     get_jwt_identity, get_jwt
@@ -8,29 +8,57 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from passlib.hash import pbkdf2_sha256
 import mysql.connector
-from mysql.connector import pooling
 import datetime
 import logging
 import os
 from flask import send_file
+import cProfile
+import codecs
+import concurrent.futures
 import csv
-from io import BytesIO, StringIO
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import hashlib
+import json
+import multiprocessing
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from io import StringIO
+from blocklist import make_blocklist
+from analytics import (
+    apply_summary_delta, bulk_update_delta, load_histograms, normalize_rating, rebuild_summaries,
+    summarize
+)
+from cache import make_cache
+from db import InstrumentedPool, PoolExhausted
+import metrics
+from reports import build_report
 # ----------------------------------------
 # Logging
 # ----------------------------------------
-logging.basicConfig(level=logging.DEBUG)
+# DEBUG logs every request and query; keep it for diagnosing, not for load
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # ----------------------------------------
 # Flask Setup
 # ----------------------------------------
 app = Flask(__name__)
-CORS(app, supports_credentials=True, resources={r"/*": {"origins": "http://localhost:8080"}})
+CORS(app, supports_credentials=True, resources={r"/*": {"origins": "http://localhost:8080"}},
+     expose_headers=["ETag", "Last-Modified"])
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["200 per day", "50 per hour"])
+# Rate limiter; point RATELIMIT_STORAGE_URI at redis:// or memcached:// so
+# every worker counts against the same limits
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["200 per day", "50 per hour"],
+    storage_uri=os.getenv("RATELIMIT_STORAGE_URI", "memory://"),
+    in_memory_fallback_enabled=True
+)
 limiter.init_app(app)
 
 # ----------------------------------------
@@ -43,11 +71,18 @@ db_config = {
     'database': os.getenv('MYSQL_DATABASE', 'employee_db'),
     'auth_plugin': 'mysql_native_password',
     'pool_name': 'mypool',
-    'pool_size': 5
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5'))
 }
 
 try:
-    connection_pool = mysql.connector.pooling.MySQLConnectionPool(**db_config)
+    connection_pool = InstrumentedPool(
+        max_overflow=int(os.getenv('DB_POOL_MAX_OVERFLOW', '10')),
+        timeout=float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        on_checkout=metrics.count_pool_checkout,
+        on_wait=metrics.POOL_WAIT.observe,
+        on_exhausted=metrics.POOL_EXHAUSTED.inc,
+        **db_config
+    )
     logger.info("✅ Database connection pool created successfully")
 except mysql.connector.Error as err:
     logger.error(f"❌ Failed to create connection pool: {err}")
@@ -56,22 +91,548 @@ except mysql.connector.Error as err:
 def get_db_connection():
     return connection_pool.get_connection()
 
+
+@contextmanager
+def db_connection():
+    """Check out a pooled connection that always goes back, rolled back on error."""
+    conn = get_db_connection()
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+@contextmanager
+def db_cursor(**cursor_args):
+    with db_connection() as conn:
+        cursor = metrics.TimedCursor(conn.cursor(**cursor_args))
+        try:
+            yield conn, cursor
+        finally:
+            cursor.close()
+
+# Plain connection settings for processes that can't share the pool
+db_params = {k: v for k, v in db_config.items() if k not in ("pool_name", "pool_size")}
+
 # ----------------------------------------
 # JWT Setup
 # ----------------------------------------
 app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "super-secret-key")
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = datetime.timedelta(hours=24)
 jwt = JWTManager(app)
-blacklisted_tokens = set()
+token_blocklist = make_blocklist(
+    os.getenv("BLOCKLIST_BACKEND", "memory"),
+    db_cursor=db_cursor,
+    url=os.getenv("BLOCKLIST_REDIS_URL", "redis://localhost:6379/0")
+)
 
 @jwt.token_in_blocklist_loader
 def check_if_token_in_blacklist(jwt_header, jwt_payload):
-    return jwt_payload["jti"] in blacklisted_tokens
+    return token_blocklist.contains(jwt_payload["jti"])
+
+# ----------------------------------------
+# Query Helpers
+# ----------------------------------------
+EMPLOYEE_FIELDS = (
+    "id", "name", "role", "productivity", "feedback",
+    "rating", "created_at", "updated_at"
+)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CSV_CHUNK_ROWS = 500
+BULK_CHUNK_ROWS = 1000
+MAX_TOP_N = 100
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def parse_number(args, key, cast):
+    raw = args.get(key)
+    if raw is None or raw == "":
+        return None
+    try:
+        return cast(raw)
+    except ValueError:
+        raise ValueError(f"{key} must be a number")
+
+
+def parse_limit(args, key, default, maximum):
+    """Parse a row count clamped to 1..maximum; only a missing value means `default`."""
+    value = parse_number(args, key, int)
+    return default if value is None else max(1, min(value, maximum))
+
+
+def build_employee_filters(args):
+    """Turn the listing query string into a WHERE clause and its params.
+
+    Supported filters: role, name_prefix, min/max_productivity, min/max_rating.
+    Raises ValueError on malformed values so routes can answer with a 400.
+    """
+    clauses, params = [], []
+
+    role = args.get("role")
+    if role:
+        clauses.append("role = %s")
+        params.append(role)
+
+    name_prefix = args.get("name_prefix")
+    if name_prefix:
+        clauses.append("name LIKE %s")
+        params.append(escape_like(name_prefix) + "%")
+
+    for key, column, op, cast in (
+        ("min_productivity", "productivity", ">=", int),
+        ("max_productivity", "productivity", "<=", int),
+        ("min_rating", "rating", ">=", float),
+        ("max_rating", "rating", "<=", float),
+    ):
+        value = parse_number(args, key, cast)
+        if value is not None:
+            clauses.append(f"{column} {op} %s")
+            params.append(value)
+
+    where = " AND ".join(clauses)
+    return where, params
+
+
+def parse_fields(args):
+    """Return the projected column list; `id` is always kept for the cursor."""
+    raw = args.get("fields")
+    if not raw:
+        return list(EMPLOYEE_FIELDS)
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    fields = [f.strip() for f in raw if f.strip()]
+    unknown = [f for f in fields if f not in EMPLOYEE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return fields
+
+
+def validate_employee(data):
+    """Apply the add_employee rules and return the row to insert.
+
+    Raises ValueError with the same messages /add responds with.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Each employee must be an object")
+    name = data.get("name")
+    role = data.get("role")
+    productivity = data.get("productivity", 0)
+    feedback = data.get("feedback", "")
+    rating = data.get("rating", None)
+
+    if not name or not role:
+        raise ValueError("Name and role are required")
+    if not isinstance(productivity, int) or productivity < 0 or productivity > 100:
+        raise ValueError("Productivity must be a valid percentage (0-100)")
+    if not valid_rating(rating):
+        raise ValueError("Rating must be a number")
+    return name, role, productivity, feedback, normalize_rating(rating)
+
+
+def valid_rating(rating):
+    return rating is None or (isinstance(rating, (int, float)) and not isinstance(rating, bool))
+
+
+def coerce_csv_row(row):
+    """Convert the numeric CSV columns so rows validate like JSON input."""
+    row = {k: v for k, v in row.items() if v not in (None, "")}
+    for key, cast in (("productivity", int), ("rating", float)):
+        if key in row:
+            try:
+                row[key] = cast(row[key])
+            except ValueError:
+                pass  # left as a string so validation reports it
+    return row
+
+
+def read_bulk_rows():
+    """Return the rows of a bulk request: a JSON array or a streamed CSV.
+
+    CSV may arrive as a multipart `file` upload or as a text/csv body and
+    is parsed lazily, so large files are never held in memory whole.
+    """
+    upload = request.files.get("file")
+    if upload is not None:
+        stream = upload.stream
+    elif request.mimetype == "text/csv":
+        stream = request.stream
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise ValueError("Expected a JSON array or a CSV upload")
+        return data
+
+    # iterdecode rather than TextIOWrapper: on Python < 3.11 the
+    # SpooledTemporaryFile behind multipart uploads has no readable()
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8"))
+    return (coerce_csv_row(row) for row in reader)
+
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_update_statement(rows):
+    """One UPDATE applying (name, role, feedback, rating, id) rows by id.
+
+    mysql-connector only folds INSERTs into a multi-row statement, so an
+    executemany of UPDATE costs a round trip per row; CASE on id does the
+    whole chunk in one. Rows must have distinct ids.
+    """
+    ids = [r[4] for r in rows]
+    cases = " ".join(["WHEN %s THEN %s"] * len(rows))
+    params = [value for column in range(4) for r in rows for value in (r[4], r[column])]
+    sql = f"""
+        UPDATE productivity
+        SET name = CASE id {cases} END,
+            role = CASE id {cases} END,
+            feedback = CASE id {cases} END,
+            rating = CASE id {cases} END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id IN ({", ".join(["%s"] * len(ids))})
+    """
+    return sql, params + ids
+
+
+def bump_data_version(cursor):
+    """Advance the productivity data version; call before the write's commit."""
+    cursor.execute("UPDATE data_version SET version = version + 1 WHERE name = 'productivity'")
+
+
+def select_employees_sql(fields, where):
+    query = f"SELECT {', '.join(fields)} FROM productivity"
+    if where:
+        query += f" WHERE {where}"
+    return query + " ORDER BY id ASC"
+
+
+def iter_rows(query, params=(), batch_size=1000):
+    """Yield rows from an unbuffered cursor in `fetchmany` batches.
+
+    Rows are pulled off the wire as they are consumed, so memory stays
+    bounded by `batch_size` however large the result set is. The pooled
+    connection is held until the generator is exhausted or closed.
+    """
+    with db_connection() as conn:
+        cursor = metrics.TimedCursor(conn.cursor(dictionary=True, buffered=False))
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # A client that disconnects mid-export leaves rows on the wire;
+            # drain them so the connection goes back to the pool clean.
+            if conn.unread_result:
+                conn.consume_results()
+            cursor.close()
+
+# ----------------------------------------
+# Response Cache
+# ----------------------------------------
+# Keys embed the persisted data version (see table_watermark), which every
+# write bumps in its own transaction, so a write through any worker retires
+# all cached pages at once. CACHE_BACKEND=redis shares entries between
+# workers; the in-process backend just caches each page once per worker.
+response_cache = make_cache(
+    os.getenv("CACHE_BACKEND", "memory"),
+    url=os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"),
+    max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=int(os.getenv("CACHE_TTL_SECONDS", "60")),
+    on_event=metrics.count_cache_event
+)
+
+
+def response_validators(watermark):
+    """ETag and Last-Modified for the current request, from the table watermark.
+
+    Callers read the watermark from the database on every request (a
+    primary-key lookup) rather than caching it, so a write made through any
+    worker changes the ETag.
+    """
+    key = json.dumps([request.full_path, watermark], default=str)
+    etag = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    last_modified = watermark[1]
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+    return etag, last_modified
+
+
+def with_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Clients may keep the body but must revalidate it on every use
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(etag, last_modified):
+    # Only ETags are honoured: Last-Modified has one-second resolution, so
+    # If-Modified-Since alone could confirm a copy from before a write made
+    # later in the same second.
+    if etag in request.if_none_match:
+        return with_validators(Response(status=304), etag, last_modified)
+    return None
+
+# ----------------------------------------
+# Report Jobs
+# ----------------------------------------
+REPORT_DIR = os.getenv("REPORT_DIR", os.path.join(tempfile.gettempdir(), "employee_reports"))
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_TTL = datetime.timedelta(hours=int(os.getenv("REPORT_TTL_HOURS", "24")))
+REPORT_TIMEOUT = int(os.getenv("REPORT_TIMEOUT_SECONDS", "1800"))
+REPORT_POLL_SECONDS = 0.5
+REPORT_FORMATS = {"pdf": "application/pdf", "csv": "text/csv"}
+REPORT_ID = re.compile(r"[0-9a-f]{32}")
+os.makedirs(REPORT_DIR, exist_ok=True)
+
+# A job's id is the digest of its artifact key, and its state lives next to
+# the artifact in REPORT_DIR/<id>.json, so any gunicorn worker can answer
+# for a job another one queued. Futures are only known to the submitter.
+report_futures = {}
+report_jobs_lock = threading.Lock()
+report_executor = None
+
+
+def get_report_executor():
+    # Spawned (not forked) workers so they never inherit pooled sockets.
+    global report_executor
+    if report_executor is None:
+        report_executor = ProcessPoolExecutor(
+            max_workers=REPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return report_executor
+
+
+def submit_report_build(*args):
+    """Submit build_report, replacing the pool once if a worker died.
+
+    A worker killed mid-job (OOM, segfault) breaks the whole executor and
+    every later submit would raise, so start a fresh one and retry.
+    """
+    global report_executor
+    try:
+        return get_report_executor().submit(build_report, *args)
+    except BrokenProcessPool:
+        logger.warning("Report worker pool was broken; starting a new one")
+        report_executor.shutdown(wait=False)
+        report_executor = None
+        return get_report_executor().submit(build_report, *args)
+
+
+def table_watermark():
+    """Data version and last write time of the productivity table.
+
+    Every write path bumps the version in its own transaction, so the pair
+    identifies a committed table snapshot for cache keys, even for several
+    writes within the same second. One primary-key read, no table scan.
+    """
+    with db_cursor() as (conn, cursor):
+        cursor.execute("SELECT version, updated_at FROM data_version WHERE name = 'productivity'")
+        watermark = cursor.fetchone()
+    return watermark
+
+
+def report_artifact(kind, args):
+    """Build the query for a report and the job id naming its artifact."""
+    where, params = build_employee_filters(args)
+    fields = parse_fields(args) if kind == "csv" else list(EMPLOYEE_FIELDS)
+    query = select_employees_sql(fields, where)
+    key = json.dumps([kind, query, params, table_watermark()], default=str)
+    job_id = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return query, params, fields, job_id
+
+
+def report_path(job, ext=None):
+    return os.path.join(REPORT_DIR, f"{job['id']}.{ext or job['format']}")
+
+
+def save_report_state(job):
+    # Rename into place so readers in other workers never see half a file
+    path = report_path(job, "json")
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(job, f)
+    os.replace(tmp_path, path)
+
+
+def load_report(job_id):
+    """Current state of a job from REPORT_DIR, or None if it is unknown.
+
+    "done" is decided by the artifact alone: a job whose artifact has been
+    pruned is unknown again, so the next submit renders it afresh.
+    """
+    if not REPORT_ID.fullmatch(job_id):
+        return None
+    try:
+        with open(os.path.join(REPORT_DIR, f"{job_id}.json")) as f:
+            job = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if os.path.exists(report_path(job)):
+        job["status"] = "done"
+    elif job["status"] == "done":
+        return None
+    elif job["status"] == "running" and time.time() - job["created_at"] > REPORT_TIMEOUT:
+        # The worker that queued it died before recording the outcome
+        job["status"] = "failed"
+        job["error"] = "Report timed out"
+    return job
+
+
+def finish_report(job, future):
+    report_futures.pop(job["id"], None)
+    error = future.exception()
+    save_report_state({**job, "status": "failed" if error else "done",
+                       "error": str(error) if error else None})
+
+
+def prune_reports(now):
+    """Delete artifacts and job states untouched for REPORT_TTL."""
+    cutoff = now - REPORT_TTL.total_seconds()
+    for name in os.listdir(REPORT_DIR):
+        path = os.path.join(REPORT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def submit_report(kind, args):
+    """Queue a report job, reusing a cached artifact or an in-flight job."""
+    query, params, fields, job_id = report_artifact(kind, args)
+    now = time.time()
+
+    with report_jobs_lock:
+        prune_reports(now)
+        job = load_report(job_id)
+        if job is not None and job["status"] != "failed":
+            return job
+
+        job = {"id": job_id, "format": kind, "status": "running", "error": None, "created_at": now}
+        if os.path.exists(report_path(job)):
+            job["status"] = "done"
+            save_report_state(job)
+            return job
+
+        save_report_state(job)
+        future = submit_report_build(kind, db_params, query, params, fields, report_path(job))
+        report_futures[job_id] = future
+        future.add_done_callback(lambda f: finish_report(job, f))
+    return job
+
+
+def wait_for_report(job):
+    """Block until a job finishes, whichever worker is rendering it."""
+    job_id = job["id"]
+    future = report_futures.get(job_id)
+    if future is not None:
+        concurrent.futures.wait([future])
+    while job["status"] == "running":
+        job = load_report(job_id)
+        if job is None:
+            raise RuntimeError(f"Report {job_id} disappeared while waiting for it")
+        if job["status"] == "running":
+            time.sleep(REPORT_POLL_SECONDS)
+    return job
+
+
+def report_response(job):
+    body = {"id": job["id"], "format": job["format"], "status": job["status"]}
+    if job["status"] == "done":
+        body["download_url"] = f"/reports/{job['id']}/download"
+    elif job["status"] == "failed":
+        body["error"] = job["error"]
+    return body
+
+
+def send_report(job, download_name):
+    # Touch the artifact and its state so pruning keeps both while the
+    # report is still being downloaded.
+    path = report_path(job)
+    os.utime(path)
+    try:
+        os.utime(report_path(job, "json"))
+    except OSError:
+        pass
+    return send_file(
+        path,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype=REPORT_FORMATS[job["format"]]
+    )
+
+# ----------------------------------------
+# Request Metrics & Profiling
+# ----------------------------------------
+# With PROFILING_ENABLED=1, a request carrying `X-Profile: 1` runs under
+# cProfile and its stats are written to PROFILE_DIR for `python -m pstats`.
+# Only the code up to the response headers is profiled, not streamed bodies.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "employee_profiles"))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if PROFILING_ENABLED and request.headers.get("X-Profile") == "1":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = metrics.current_route()
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = f"{route.strip('/').replace('/', '_') or 'root'}-{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+        response.headers["X-Profile-File"] = name
+
+    if "request_start" in g:
+        metrics.REQUEST_LATENCY.labels(route, request.method).observe(time.perf_counter() - g.request_start)
+    metrics.REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+    if response.content_length is not None:
+        metrics.RESPONSE_BYTES.labels(route).observe(response.content_length)
+    elif response.is_streamed:
+        response.response = metrics.count_streamed_bytes(response.response, route)
+    return response
 
 # ----------------------------------------
 # Routes
 # ----------------------------------------
 
+@app.errorhandler(PoolExhausted)
+def pool_exhausted(err):
+    logger.warning(f"Connection pool exhausted: {err}")
+    return jsonify({"msg": "Database is busy, please retry"}), 503, {"Retry-After": "1"}
+
+
 @app.route('/')
 def health():
     return jsonify({"status": "running"}), 200
@@ -87,12 +648,9 @@ def login():
     if not username or not password:
         return jsonify({"msg": "Missing username or password"}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM admins WHERE username = %s", (username,))
-    user = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    with db_cursor(dictionary=True) as (conn, cursor):
+        cursor.execute("SELECT password_hash FROM admins WHERE username = %s", (username,))
+        user = cursor.fetchone()
 
     if not user or not pbkdf2_sha256.verify(password, user["password_hash"]):
         return jsonify({"msg": "Invalid username or password"}), 401
@@ -105,13 +663,45 @@ def login():
 @app.route("/employees", methods=["GET"])
 @jwt_required()
 def get_employees():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM productivity ORDER BY id ASC")
-    employees = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return jsonify({"employees": employees}), 200
+    try:
+        where, params = build_employee_filters(request.args)
+        fields = parse_fields(request.args)
+        limit = parse_limit(request.args, "limit", DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        after = parse_number(request.args, "after", int)
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    # Keyset pagination: seek past the last seen id instead of OFFSET, so
+    # every page is an index range scan no matter how deep the client goes.
+    if after is not None:
+        where = f"{where} AND id > %s" if where else "id > %s"
+        params.append(after)
+
+    query = select_employees_sql(fields, where) + " LIMIT %s"
+    params.append(limit + 1)
+
+    watermark = table_watermark()
+    etag, last_modified = response_validators(watermark)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    key = f"employees:{watermark[0]}:{request.full_path}"
+    body = response_cache.get(key)
+    if body is None:
+        with db_cursor(dictionary=True) as (conn, cursor):
+            cursor.execute(query, params)
+            employees = cursor.fetchall()
+
+        next_cursor = None
+        if len(employees) > limit:
+            employees = employees[:limit]
+            next_cursor = employees[-1]["id"]
+
+        body = app.json.dumps({"employees": employees, "next_cursor": next_cursor})
+        response_cache.set(key, body)
+
+    return with_validators(Response(body, mimetype="application/json"), etag, last_modified)
 
 
 # ---------- UPDATE EMPLOYEE ----------
@@ -126,29 +716,35 @@ def update_employee(emp_id):
 
     if not all([name, role]):
         return jsonify({"msg": "Missing required fields"}), 400
+    if not valid_rating(rating):
+        return jsonify({"msg": "Rating must be a number"}), 400
+    rating = normalize_rating(rating)
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE productivity
-        SET name=%s, role=%s, feedback=%s, rating=%s, updated_at=CURRENT_TIMESTAMP
-        WHERE id=%s
-    """, (name, role, feedback, rating, emp_id))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with db_cursor() as (conn, cursor):
+        cursor.execute("SELECT role, productivity, rating FROM productivity WHERE id=%s FOR UPDATE", (emp_id,))
+        old = cursor.fetchone()
+        cursor.execute("""
+            UPDATE productivity
+            SET name=%s, role=%s, feedback=%s, rating=%s, updated_at=CURRENT_TIMESTAMP
+            WHERE id=%s
+        """, (name, role, feedback, rating, emp_id))
+        if old:
+            apply_summary_delta(cursor, removed=[old], added=[(role, old[1], rating)])
+        bump_data_version(cursor)
+        conn.commit()
     return jsonify({"msg": "Employee updated successfully"}), 200
 
 # ---------- DELETE EMPLOYEE ----------
 @app.route("/employee/<int:emp_id>", methods=["DELETE"])
 @jwt_required()
 def delete_employee(emp_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM productivity WHERE id=%s", (emp_id,))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with db_cursor() as (conn, cursor):
+        cursor.execute("SELECT role, productivity, rating FROM productivity WHERE id=%s FOR UPDATE", (emp_id,))
+        old = cursor.fetchall()
+        cursor.execute("DELETE FROM productivity WHERE id=%s", (emp_id,))
+        apply_summary_delta(cursor, removed=old)
+        bump_data_version(cursor)
+        conn.commit()
     return jsonify({"msg": "Employee deleted successfully"}), 200
 
 
@@ -157,115 +753,310 @@ def delete_employee(emp_id):
 @app.route("/add", methods=["POST"])
 @jwt_required()
 def add_employee():
-    data = request.get_json()
-    name = data.get("name")
-    role = data.get("role")
-    productivity = data.get("productivity", 0)
-    feedback = data.get("feedback", "")
-    rating = data.get("rating", None)
-
     # Validation
-    if not name or not role:
-        return jsonify({"msg": "Name and role are required"}), 400
-    if not isinstance(productivity, int) or productivity < 0 or productivity > 100:
-        return jsonify({"msg": "Productivity must be a valid percentage (0-100)"}), 400
+    try:
+        row = validate_employee(request.get_json())
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO productivity (name, role, productivity, feedback, rating)
-        VALUES (%s, %s, %s, %s, %s)
-    """, (name, role, productivity, feedback, rating))
-    conn.commit()
-    new_id = cursor.lastrowid
-    cursor.close()
-    conn.close()
+    with db_cursor() as (conn, cursor):
+        cursor.execute("""
+            INSERT INTO productivity (name, role, productivity, feedback, rating)
+            VALUES (%s, %s, %s, %s, %s)
+        """, row)
+        new_id = cursor.lastrowid
+        apply_summary_delta(cursor, added=[(row[1], row[2], row[4])])
+        bump_data_version(cursor)
+        conn.commit()
 
     return jsonify({"msg": "Employee added successfully", "id": new_id}), 201
 
 
+# ---------- BULK IMPORT ----------
+@app.route("/employees/bulk", methods=["POST"])
+@jwt_required()
+def bulk_add_employees():
+    try:
+        rows = read_bulk_rows()
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    errors = []
+
+    def valid_rows():
+        for index, data in enumerate(rows):
+            try:
+                yield validate_employee(data)
+            except ValueError as err:
+                errors.append({"row": index, "msg": str(err)})
+
+    # One executemany + commit per chunk: the connector folds each chunk
+    # into a single multi-row INSERT instead of a round trip per employee.
+    inserted = 0
+    with db_cursor() as (conn, cursor):
+        for chunk in chunked(valid_rows(), BULK_CHUNK_ROWS):
+            cursor.executemany("""
+                INSERT INTO productivity (name, role, productivity, feedback, rating)
+                VALUES (%s, %s, %s, %s, %s)
+            """, chunk)
+            apply_summary_delta(cursor, added=[(r[1], r[2], r[4]) for r in chunk])
+            bump_data_version(cursor)
+            conn.commit()
+            inserted += len(chunk)
+
+    status = 201 if inserted or not errors else 400
+    return jsonify({"msg": f"{inserted} employees added", "inserted": inserted, "errors": errors}), status
+
+
+# ---------- BULK UPDATE ----------
+@app.route("/employees/bulk", methods=["PUT"])
+@jwt_required()
+def bulk_update_employees():
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return jsonify({"msg": "Expected a JSON array"}), 400
+
+    errors, rows = [], []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            errors.append({"row": index, "msg": "Missing employee id"})
+        elif not all([item.get("name"), item.get("role")]):
+            errors.append({"row": index, "msg": "Missing required fields"})
+        elif not valid_rating(item.get("rating")):
+            errors.append({"row": index, "msg": "Rating must be a number"})
+        else:
+            rows.append((item["name"], item["role"], item.get("feedback"),
+                         normalize_rating(item.get("rating")), item["id"]))
+
+    updated = 0
+    with db_cursor() as (conn, cursor):
+        for chunk in chunked(rows, BULK_CHUNK_ROWS):
+            ids = sorted({r[4] for r in chunk})
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"SELECT id, role, productivity, rating FROM productivity WHERE id IN ({placeholders}) FOR UPDATE",
+                ids
+            )
+            old = {r[0]: r[1:] for r in cursor.fetchall()}
+            if not old:
+                continue
+            # Last row per id wins, as if the rows were applied in order
+            final = {r[4]: r for r in chunk if r[4] in old}
+            cursor.execute(*bulk_update_statement([final[i] for i in sorted(final)]))
+            # Distinct existing ids, whether or not their values changed
+            updated += len(final)
+            removed, added = bulk_update_delta(chunk, old)
+            apply_summary_delta(cursor, removed=removed, added=added)
+            bump_data_version(cursor)
+            conn.commit()
+
+    return jsonify({"msg": f"{updated} employees updated", "updated": updated, "errors": errors}), 200
+
+
+# ---------- BULK DELETE ----------
+@app.route("/employees/bulk", methods=["DELETE"])
+@jwt_required()
+def bulk_delete_employees():
+    data = request.get_json(silent=True) or {}
+    ids = data.get("ids") if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+        return jsonify({"msg": "ids must be a list of employee ids"}), 400
+
+    deleted = 0
+    with db_cursor() as (conn, cursor):
+        for chunk in chunked(ids, BULK_CHUNK_ROWS):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(
+                f"SELECT role, productivity, rating FROM productivity WHERE id IN ({placeholders}) FOR UPDATE",
+                chunk
+            )
+            old = cursor.fetchall()
+            cursor.execute(f"DELETE FROM productivity WHERE id IN ({placeholders})", chunk)
+            deleted += cursor.rowcount
+            apply_summary_delta(cursor, removed=old)
+            bump_data_version(cursor)
+            conn.commit()
+
+    return jsonify({"msg": f"{deleted} employees deleted", "deleted": deleted}), 200
+
+
+# ---------- ANALYTICS ----------
+@app.route("/analytics", methods=["GET"])
+@jwt_required()
+def get_analytics():
+    with db_cursor() as (conn, cursor):
+        summary = summarize(*load_histograms(cursor))
+    return jsonify(summary), 200
+
+
+@app.route("/analytics/top", methods=["GET"])
+@jwt_required()
+def get_top_employees():
+    try:
+        n = parse_limit(request.args, "n", 10, MAX_TOP_N)
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
+    # Same direction on both keys so MySQL can walk the index instead of sorting
+    direction = "ASC" if request.args.get("order") == "bottom" else "DESC"
+
+    query = "SELECT id, name, role, productivity, rating FROM productivity"
+    params = []
+    role = request.args.get("role")
+    if role:
+        query += " WHERE role = %s"
+        params.append(role)
+    query += f" ORDER BY productivity {direction}, id {direction} LIMIT %s"
+    params.append(n)
+
+    with db_cursor(dictionary=True) as (conn, cursor):
+        cursor.execute(query, params)
+        employees = cursor.fetchall()
+    return jsonify({"employees": employees}), 200
+
+
+@app.route("/analytics/rebuild", methods=["POST"])
+@jwt_required()
+def rebuild_analytics():
+    with db_cursor() as (conn, cursor):
+        rebuild_summaries(cursor)
+        bump_data_version(cursor)
+        conn.commit()
+    return jsonify({"msg": "Analytics summaries rebuilt"}), 200
+
+
+# ---------- METRICS ----------
+@app.route("/metrics", methods=["GET"])
+@limiter.exempt
+def prometheus_metrics():
+    body, content_type = metrics.render_metrics()
+    return Response(body, content_type=content_type)
+
+
+# ---------- POOL STATS ----------
+@app.route("/pool/stats", methods=["GET"])
+@jwt_required()
+def pool_stats():
+    # This worker's pool only; db_pool_checkouts_total, *_wait_seconds and
+    # *_exhausted_total on /metrics add up every worker.
+    return jsonify(connection_pool.stats()), 200
+
+
+# ---------- CACHE STATS ----------
+@app.route("/cache/stats", methods=["GET"])
+@jwt_required()
+def cache_stats():
+    # This worker's counters only; response_cache_events_total on /metrics
+    # adds up every worker.
+    return jsonify(response_cache.stats()), 200
+
+
 # ---------- LOGOUT ----------
 @app.route("/logout", methods=["POST"])
 @jwt_required()
 def logout():
-    jti = get_jwt()["jti"]
-    blacklisted_tokens.add(jti)
+    claims = get_jwt()
+    token_blocklist.add(claims["jti"], claims["exp"])
     return jsonify({"msg": "Successfully logged out"}), 200
 
 # ---------- EXPORT CSV ----------
 @app.route("/export/csv", methods=["GET"])
 @jwt_required()
 def export_csv():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM productivity ORDER BY id ASC")
-    employees = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=employees[0].keys())
-    writer.writeheader()
-    writer.writerows(employees)
-    output.seek(0)
+    try:
+        where, params = build_employee_filters(request.args)
+        fields = parse_fields(request.args)
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
 
-    return send_file(
-        BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name='employee_report.csv'
+    query = select_employees_sql(fields, where)
+
+    etag, last_modified = response_validators(table_watermark())
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    def generate():
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+        for i, row in enumerate(iter_rows(query, params), 1):
+            writer.writerow(row)
+            if i % CSV_CHUNK_ROWS == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
+
+    # Keep the request context while streaming so DB metrics carry the route
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=employee_report.csv"}
     )
+    return with_validators(response, etag, last_modified)
 
 
 # ---------- EXPORT PDF ----------
 @app.route("/export/pdf", methods=["GET"])
 @jwt_required()
 def export_pdf():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM productivity ORDER BY id ASC")
-    employees = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    buffer = BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    pdf.setFont("Helvetica-Bold", 16)
-    pdf.drawString(200, height - 50, "Employee Productivity Report")
-
-    pdf.setFont("Helvetica", 10)
-    y = height - 100
-    pdf.drawString(50, y, "ID")
-    pdf.drawString(100, y, "Name")
-    pdf.drawString(250, y, "Role")
-    pdf.drawString(400, y, "Prod(%)")
-    pdf.drawString(470, y, "Rating")
-    y -= 20
-
-    for emp in employees:
-        if y < 50:
-            pdf.showPage()
-            y = height - 50
-            pdf.setFont("Helvetica", 10)
-        pdf.drawString(50, y, str(emp["id"]))
-        pdf.drawString(100, y, emp["name"][:20])
-        pdf.drawString(250, y, emp["role"][:25])
-        pdf.drawString(400, y, str(emp["productivity"]))
-        pdf.drawString(470, y, str(emp["rating"] or "-"))
-        y -= 20
-
-    pdf.save()
-    buffer.seek(0)
+    etag, last_modified = response_validators(table_watermark())
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
 
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name="employee_report.pdf",
-        mimetype="application/pdf"
-    )
+    try:
+        job = submit_report("pdf", request.args)
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    # Synchronous variant of POST /reports: unchanged data is served straight
+    # from the artifact cache, otherwise wait for the pool to render it.
+    job = wait_for_report(job)
+    if job["status"] == "failed":
+        return jsonify({"msg": f"Report failed: {job['error']}"}), 500
+    return with_validators(send_report(job, "employee_report.pdf"), etag, last_modified)
+
+
+# ---------- REPORT JOBS ----------
+@app.route("/reports", methods=["POST"])
+@jwt_required()
+def create_report():
+    data = request.get_json(silent=True) or {}
+    kind = data.get("format", "pdf")
+    if kind not in REPORT_FORMATS:
+        return jsonify({"msg": f"Format must be one of: {', '.join(REPORT_FORMATS)}"}), 400
+
+    try:
+        job = submit_report(kind, data.get("filters") or {})
+    except ValueError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    body = report_response(job)
+    body["status_url"] = f"/reports/{job['id']}"
+    return jsonify(body), 200 if body["status"] == "done" else 202
+
+
+@app.route("/reports/<job_id>", methods=["GET"])
+@jwt_required()
+def get_report(job_id):
+    job = load_report(job_id)
+    if job is None:
+        return jsonify({"msg": "Report not found"}), 404
+    return jsonify(report_response(job)), 200
+
+
+@app.route("/reports/<job_id>/download", methods=["GET"])
+@jwt_required()
+def download_report(job_id):
+    job = load_report(job_id)
+    if job is None:
+        return jsonify({"msg": "Report not found"}), 404
+    if job["status"] != "done":
+        return jsonify({"msg": "Report is not ready"}), 409
+    return send_report(job, f"employee_report.{job['format']}")
 
 # ---------- MAIN ----------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
+    app.run(host="0.0.0.0", port=5000, debug=os.getenv("FLASK_DEBUG", "1") == "1")
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Revoked-token stores checked by the JWT blocklist loader.
+
+Entries are keyed by the token's `jti` and kept only until its `exp`; after
+that the token is rejected as expired anyway. Pick one with
+BLOCKLIST_BACKEND: `memory` (per-process), `sql` (token_blocklist table,
+shared by every worker) or `redis` (shared, needs the `redis` package).
+"""
+import heapq
+import threading
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class MemoryBlocklist:
+    """Dict lookup plus an expiry heap so pruning costs O(log n) per token."""
+
+    def __init__(self):
+        self._revoked = {}
+        self._expiry = []
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        while self._expiry and self._expiry[0][0] <= now:
+            exp, jti = heapq.heappop(self._expiry)
+            if self._revoked.get(jti) == exp:
+                del self._revoked[jti]
+
+    def add(self, jti, exp):
+        with self._lock:
+            self._prune(time.time())
+            self._revoked[jti] = exp
+            heapq.heappush(self._expiry, (exp, jti))
+
+    def contains(self, jti):
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+class SQLBlocklist:
+    """token_blocklist table; lookups are a primary-key probe."""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, db_cursor):
+        self._db_cursor = db_cursor
+        self._adds = 0
+
+    def add(self, jti, exp):
+        with self._db_cursor() as (conn, cursor):
+            cursor.execute("""
+                INSERT INTO token_blocklist (jti, expires_at)
+                VALUES (%s, FROM_UNIXTIME(%s))
+                ON DUPLICATE KEY UPDATE expires_at = VALUES(expires_at)
+            """, (jti, exp))
+            self._adds += 1
+            if self._adds % self.PRUNE_EVERY == 0:
+                cursor.execute("DELETE FROM token_blocklist WHERE expires_at <= NOW()")
+            conn.commit()
+
+    def contains(self, jti):
+        with self._db_cursor() as (conn, cursor):
+            cursor.execute(
+                "SELECT 1 FROM token_blocklist WHERE jti = %s AND expires_at > NOW()", (jti,)
+            )
+            return cursor.fetchone() is not None
+
+    def __len__(self):
+        with self._db_cursor() as (conn, cursor):
+            cursor.execute("SELECT COUNT(*) FROM token_blocklist WHERE expires_at > NOW()")
+            return cursor.fetchone()[0]
+
+
+class RedisBlocklist:
+    """One key per revoked jti, expiring with the token itself."""
+
+    def __init__(self, url, prefix="emp:blocklist:"):
+        if redis is None:
+            raise RuntimeError("BLOCKLIST_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def add(self, jti, exp):
+        ttl = int(exp - time.time())
+        if ttl > 0:
+            self.client.set(self.prefix + jti, 1, ex=ttl)
+
+    def contains(self, jti):
+        return bool(self.client.exists(self.prefix + jti))
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(self.prefix + "*"))
+
+
+def make_blocklist(backend, db_cursor=None, url=None):
+    if backend == "sql":
+        return SQLBlocklist(db_cursor)
+    if backend == "redis":
+        return RedisBlocklist(url)
+    return MemoryBlocklist()
@@ -0,0 +1,134 @@
+"""Response cache backends.
+
+`LRUCache` is per-process; `RedisCache` is shared by every worker and is
+used when CACHE_BACKEND=redis (needs the optional `redis` package).
+Both expose the same get/set/stats interface. Nothing is invalidated
+explicitly: callers embed a data version in their keys, so entries for an
+old version just stop being read and age out. stats() covers this process
+only; an `on_event` callback sees every hit, miss, eviction, expiration
+and error so a metrics backend can count them across workers.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry TTL and entry/byte limits."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=60, on_event=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._on_event = on_event
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def _count(self, name):
+        # Called with the lock held
+        self._stats[name] += 1
+        if self._on_event:
+            self._on_event(name)
+
+    @staticmethod
+    def _size(value):
+        return len(value) if isinstance(value, (bytes, str)) else sys.getsizeof(value)
+
+    def _pop(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._count("misses")
+                return None
+            value, expires, _ = entry
+            if expires is not None and expires < time.monotonic():
+                self._pop(key)
+                self._count("expirations")
+                self._count("misses")
+                return None
+            self._data.move_to_end(key)
+            self._count("hits")
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (value, expires, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+                self._count("evictions")
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "entries": len(self._data), "bytes": self._bytes, "backend": "memory"}
+
+
+class RedisCache:
+    """Shared cache on Redis; eviction is left to the server's maxmemory policy.
+
+    Values must be str or bytes and come back as bytes. While Redis is
+    unreachable every get is a miss and sets are dropped, so callers fall
+    back to the database instead of failing.
+    """
+
+    def __init__(self, url, ttl=60, prefix="emp:", on_event=None):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        # Short timeouts so an unresponsive server costs a miss, not a hung request
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._on_event = on_event
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "errors": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+        if self._on_event:
+            self._on_event(name)
+
+    def get(self, key):
+        try:
+            value = self.client.get(self.prefix + key)
+        except redis.RedisError:
+            self._count("errors")
+            value = None
+        self._count("misses" if value is None else "hits")
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self.client.set(self.prefix + key, value, ex=ttl or None)
+        except redis.RedisError:
+            self._count("errors")
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "backend": "redis"}
+
+
+def make_cache(backend, url=None, **options):
+    if backend == "redis":
+        return RedisCache(url, ttl=options.get("ttl", 60), on_event=options.get("on_event"))
+    return LRUCache(**options)
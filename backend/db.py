@@ -0,0 +1,116 @@
+"""MySQL connection pool with overflow, checkout timeout and counters.
+
+mysql-connector's MySQLConnectionPool raises as soon as it is empty and
+caps pool_size at 32. This wraps it so callers wait up to `timeout` for a
+slot, may open up to `max_overflow` short-lived extra connections, and
+leave checkout/wait/exhaustion numbers behind for monitoring. Those
+numbers are per process; `on_checkout`, `on_wait` and `on_exhausted`
+callbacks let a metrics backend observe the same events across workers.
+"""
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+
+class PoolExhausted(Exception):
+    """No connection became free within the checkout timeout."""
+
+
+class PooledConnection:
+    """Proxy for a checked-out connection whose close() frees its slot."""
+
+    def __init__(self, pool, conn, overflow):
+        self._pool = pool
+        self._conn = conn
+        self._overflow = overflow
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._conn.close()
+        finally:
+            self._pool._release()
+
+
+class InstrumentedPool:
+    def __init__(self, pool_name, pool_size, max_overflow=0, timeout=10,
+                 on_checkout=None, on_wait=None, on_exhausted=None, **params):
+        self._params = params
+        self._on_checkout = on_checkout
+        self._on_wait = on_wait
+        self._on_exhausted = on_exhausted
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name=pool_name,
+            pool_size=min(pool_size, pooling.CNX_POOL_MAXSIZE),
+            **params
+        )
+        self.size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(pool_size + max_overflow)
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "overflow_checkouts": 0,
+            "exhausted": 0,
+            "in_use": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def get_connection(self):
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["exhausted"] += 1
+            if self._on_exhausted:
+                self._on_exhausted()
+            raise PoolExhausted(f"No database connection free after {self.timeout}s")
+        waited = time.monotonic() - start
+
+        overflow = False
+        try:
+            try:
+                conn = self._pool.get_connection()
+            except PoolError:
+                # Every pooled connection is out; the slot we hold is overflow
+                conn = mysql.connector.connect(**self._params)
+                overflow = True
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["overflow_checkouts"] += overflow
+            self._stats["in_use"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        if self._on_checkout:
+            self._on_checkout(overflow)
+        if self._on_wait:
+            self._on_wait(waited)
+        return PooledConnection(self, conn, overflow)
+
+    def _release(self):
+        with self._lock:
+            self._stats["in_use"] -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "timeout": self.timeout,
+            }
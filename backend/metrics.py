@@ -0,0 +1,122 @@
+"""Prometheus metrics for requests, database calls and the connection pool.
+
+Under gunicorn set PROMETHEUS_MULTIPROC_DIR so every worker writes its
+samples there and /metrics aggregates all of them (see gunicorn.conf.py).
+"""
+import os
+import time
+
+from flask import has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served", ["route", "method", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time until the response headers are ready",
+    ["route", "method"], buckets=LATENCY_BUCKETS
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_bytes", "Response body size, counted as streamed bodies are sent",
+    ["route"], buckets=SIZE_BUCKETS
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Time spent in cursor execute and fetch calls",
+    ["route"], buckets=LATENCY_BUCKETS
+)
+DB_ROWS = Counter("db_rows_returned_total", "Rows fetched from MySQL", ["route"])
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool", ["overflow"]
+)
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+)
+POOL_EXHAUSTED = Counter("db_pool_exhausted_total", "Checkouts that timed out waiting for a connection")
+CACHE_EVENTS = Counter(
+    "response_cache_events_total", "Response cache hits, misses, evictions, expirations and errors",
+    ["event"]
+)
+
+
+def count_pool_checkout(overflow):
+    POOL_CHECKOUTS.labels("true" if overflow else "false").inc()
+
+
+def count_cache_event(event):
+    CACHE_EVENTS.labels(event).inc()
+
+
+def current_route():
+    if has_request_context() and request.url_rule is not None:
+        return request.url_rule.rule
+    return "-"
+
+
+class TimedCursor:
+    """Cursor proxy that records query time and fetched rows per route."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._route = current_route()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            DB_QUERY_SECONDS.labels(self._route).observe(time.perf_counter() - start)
+
+    def execute(self, *args):
+        return self._timed(self._cursor.execute, *args)
+
+    def executemany(self, *args):
+        return self._timed(self._cursor.executemany, *args)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            DB_ROWS.labels(self._route).inc()
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._timed(self._cursor.fetchmany, *args)
+        DB_ROWS.labels(self._route).inc(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        DB_ROWS.labels(self._route).inc(len(rows))
+        return rows
+
+
+def count_streamed_bytes(body, route):
+    size = 0
+    try:
+        for chunk in body:
+            size += len(chunk) if isinstance(chunk, bytes) else len(chunk.encode("utf-8"))
+            yield chunk
+    finally:
+        RESPONSE_BYTES.labels(route).observe(size)
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+
+
+def render_metrics():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,86 @@
+"""Report rendering run inside the report process pool.
+
+Kept apart from app.py so spawned workers can import it without building
+the Flask app or its connection pool. Each job opens its own connection.
+"""
+import csv
+import os
+
+import mysql.connector
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+FETCH_BATCH = 1000
+
+
+def iter_report_rows(db_params, query, params):
+    conn = mysql.connector.connect(**db_params)
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def write_pdf(rows, path):
+    pdf = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+
+    pdf.setFont("Helvetica-Bold", 16)
+    pdf.drawString(200, height - 50, "Employee Productivity Report")
+
+    pdf.setFont("Helvetica", 10)
+    y = height - 100
+    pdf.drawString(50, y, "ID")
+    pdf.drawString(100, y, "Name")
+    pdf.drawString(250, y, "Role")
+    pdf.drawString(400, y, "Prod(%)")
+    pdf.drawString(470, y, "Rating")
+    y -= 20
+
+    for emp in rows:
+        if y < 50:
+            pdf.showPage()
+            y = height - 50
+            pdf.setFont("Helvetica", 10)
+        pdf.drawString(50, y, str(emp["id"]))
+        pdf.drawString(100, y, (emp["name"] or "")[:20])
+        pdf.drawString(250, y, (emp["role"] or "")[:25])
+        pdf.drawString(400, y, str(emp["productivity"]))
+        pdf.drawString(470, y, str(emp["rating"] or "-"))
+        y -= 20
+
+    pdf.save()
+
+
+def write_csv(rows, path, fields):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def build_report(kind, db_params, query, params, fields, path):
+    """Render a report to `path` and return it.
+
+    Writes to a temp file first and renames it into place, so a reader
+    never sees a half-written artifact in the cache directory.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    rows = iter_report_rows(db_params, query, params)
+    try:
+        if kind == "pdf":
+            write_pdf(rows, tmp_path)
+        else:
+            write_csv(rows, tmp_path, fields)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
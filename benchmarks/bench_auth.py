@@ -0,0 +1,77 @@
+"""Per-request JWT + blocklist overhead for each blocklist backend.
+
+Usage:
+    python benchmarks/bench_auth.py --requests 5000 --revoked 100000
+
+Registers two no-op routes, one public and one behind @jwt_required(), and
+times both through the test client; the difference is the auth cost. The
+blocklist is pre-filled with --revoked tokens so lookups run at size.
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+
+from common import auth_header, load_app
+
+
+def timings(client, path, headers, requests):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path, headers=headers)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--revoked", type=int, default=100000)
+    parser.add_argument("--backends", nargs="+", default=["memory", "sql", "redis"])
+    args = parser.parse_args()
+
+    backend = load_app()
+    from blocklist import make_blocklist
+    from flask_jwt_extended import jwt_required
+
+    @backend.app.route("/_bench/public")
+    def bench_public():
+        return "", 204
+
+    @backend.app.route("/_bench/auth")
+    @jwt_required()
+    def bench_auth():
+        return "", 204
+
+    client = backend.app.test_client()
+    headers = auth_header(backend)
+    baseline = statistics.median(timings(client, "/_bench/public", {}, args.requests))
+    exp = time.time() + 3600
+
+    for name in args.backends:
+        try:
+            store = make_blocklist(name, db_cursor=backend.db_cursor,
+                                   url="redis://localhost:6379/0")
+            store.contains("probe")
+        except Exception as err:
+            print(json.dumps({"backend": name, "skipped": str(err)}))
+            continue
+        for _ in range(args.revoked if name == "memory" else min(args.revoked, 10000)):
+            store.add(uuid.uuid4().hex, exp)
+        backend.token_blocklist = store
+
+        samples = timings(client, "/_bench/auth", headers, args.requests)
+        p50 = statistics.median(samples)
+        print(json.dumps({
+            "backend": name,
+            "requests": args.requests,
+            "p50_ms": round(p50 * 1000, 3),
+            "p99_ms": round(statistics.quantiles(samples, n=100)[98] * 1000, 3),
+            "auth_overhead_ms": round((p50 - baseline) * 1000, 3),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Rows/sec of bulk writes against one-at-a-time ones.
+
+POST /employees/bulk (JSON and CSV) is timed against POST /add, and
+PUT /employees/bulk against PUT /employee/<id> on a table seeded with
+--rows employees.
+
+Usage:
+    BENCH_WIPE_DATABASE=employee_db python benchmarks/bench_bulk_import.py \\
+        --rows 50000 --single-rows 500
+"""
+import argparse
+import csv
+import io
+import json
+import time
+
+from common import auth_header, load_app, seed_employees, synthetic_employee
+
+COLUMNS = ("name", "role", "productivity", "feedback", "rating")
+
+
+def employees(rows):
+    return [dict(zip(COLUMNS, synthetic_employee(i))) for i in range(rows)]
+
+
+def as_csv(payload):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=COLUMNS)
+    writer.writeheader()
+    writer.writerows(payload)
+    return output.getvalue().encode("utf-8")
+
+
+def existing_ids(backend):
+    with backend.db_cursor() as (conn, cursor):
+        cursor.execute("SELECT id FROM productivity ORDER BY id")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def timed(label, rows, send):
+    start = time.perf_counter()
+    send()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "mode": label,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--single-rows", type=int, default=500)
+    args = parser.parse_args()
+
+    backend = load_app()
+    client = backend.app.test_client()
+    headers = auth_header(backend)
+    payload = employees(args.rows)
+
+    def single():
+        for emp in payload[:args.single_rows]:
+            assert client.post("/add", json=emp, headers=headers).status_code == 201
+
+    def bulk_json():
+        assert client.post("/employees/bulk", json=payload, headers=headers).status_code == 201
+
+    def bulk_csv():
+        assert client.post(
+            "/employees/bulk", data=as_csv(payload), content_type="text/csv", headers=headers
+        ).status_code == 201
+
+    for label, rows, send in (
+        ("single_add", args.single_rows, single),
+        ("bulk_json", args.rows, bulk_json),
+        ("bulk_csv", args.rows, bulk_csv),
+    ):
+        seed_employees(backend, 0)
+        timed(label, rows, send)
+
+    seed_employees(backend, args.rows)
+    updates = [
+        {**emp, "id": emp_id, "feedback": "Updated by benchmark"}
+        for emp_id, emp in zip(existing_ids(backend), payload)
+    ]
+
+    def single_put():
+        for emp in updates[:args.single_rows]:
+            assert client.put(f"/employee/{emp['id']}", json=emp, headers=headers).status_code == 200
+
+    def bulk_put():
+        assert client.put("/employees/bulk", json=updates, headers=headers).status_code == 200
+
+    timed("single_put", args.single_rows, single_put)
+    timed("bulk_put", len(updates), bulk_put)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Peak worker RSS of GET /export/csv against table size.
+
+Usage:
+    BENCH_WIPE_DATABASE=employee_db python benchmarks/bench_export_csv.py \\
+        --rows 10000 100000 1000000
+
+Each row count is seeded into the database, then exported in a fresh
+subprocess so ru_maxrss reflects that single export only. With the
+streaming exporter the peak should stay roughly flat as rows grow.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from common import auth_header, load_app, peak_rss_mb, seed_employees
+
+
+def measure():
+    backend = load_app()
+    client = backend.app.test_client()
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    response = client.get("/export/csv", headers=auth_header(backend), buffered=False)
+    size = 0
+    for chunk in response.iter_encoded():
+        size += len(chunk)
+    response.close()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "status": response.status_code,
+        "bytes": size,
+        "seconds": round(elapsed, 3),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure()
+        return
+
+    backend = load_app()
+    for rows in args.rows:
+        seed_employees(backend, rows)
+        out = subprocess.run(
+            [sys.executable, __file__, "--measure"],
+            check=True, capture_output=True, text=True
+        ).stdout.strip().splitlines()[-1]
+        result = {"rows": rows, **json.loads(out)}
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
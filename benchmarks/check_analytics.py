@@ -0,0 +1,109 @@
+"""Check the incremental /analytics summaries against a full recomputation.
+
+Usage:
+    BENCH_WIPE_DATABASE=employee_db python benchmarks/check_analytics.py \\
+        --rows 10000 --ops 2000
+
+Seeds the table, drives a random mix of single and bulk add/update/delete
+writes through the API (bulk updates repeat ids within a batch), then
+compares GET /analytics with the same summary built from a GROUP BY scan of
+the productivity table. Exits non-zero on drift and
+prints the /analytics latency, which should not grow with --rows.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+from common import ROLES, auth_header, load_app, seed_employees, synthetic_employee
+
+from analytics import SCAN_SQL, load_histograms, summarize
+
+COLUMNS = ("name", "role", "productivity", "feedback", "rating")
+
+
+def close_enough(a, b):
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(close_enough(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(close_enough(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and math.isclose(a, b, abs_tol=0.011)
+    return a == b
+
+
+def random_writes(client, headers, ops, rng):
+    ids = [e["id"] for e in client.get(
+        "/employees?fields=id&limit=1000", headers=headers).get_json()["employees"]]
+
+    def employee():
+        return dict(zip(COLUMNS, synthetic_employee(rng.randint(0, 10 ** 6), rng)))
+
+    def update_for(emp_id):
+        emp = employee()
+        # Just under a whole star: stored as the next one by the FLOAT column
+        rating = rng.choice([None, emp["rating"], rng.randint(1, 5) - 1e-8])
+        return {
+            "id": emp_id, "name": emp["name"], "role": rng.choice(ROLES),
+            "feedback": emp["feedback"], "rating": rating,
+        }
+
+    for _ in range(ops):
+        op = rng.random()
+        if op < 0.25 or not ids:
+            ids.append(client.post("/add", json=employee(), headers=headers).get_json()["id"])
+        elif op < 0.5:
+            emp_id = rng.choice(ids)
+            client.put(f"/employee/{emp_id}", json=update_for(emp_id), headers=headers)
+        elif op < 0.65:
+            client.delete(f"/employee/{ids.pop(rng.randrange(len(ids)))}", headers=headers)
+        elif op < 0.75:
+            client.post("/employees/bulk", json=[employee() for _ in range(20)], headers=headers)
+        elif op < 0.9:
+            # Repeat some ids in the batch: only the last update per id sticks
+            targets = [rng.choice(ids) for _ in range(15)]
+            targets += rng.sample(targets, 5)
+            client.put("/employees/bulk", json=[update_for(i) for i in targets], headers=headers)
+        else:
+            victims = [ids.pop(rng.randrange(len(ids))) for _ in range(min(10, len(ids)))]
+            client.delete("/employees/bulk", json={"ids": victims}, headers=headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    backend = load_app()
+    client = backend.app.test_client()
+    headers = auth_header(backend)
+
+    seed_employees(backend, args.rows)
+    random_writes(client, headers, args.ops, random.Random(args.seed))
+
+    start = time.perf_counter()
+    incremental = client.get("/analytics", headers=headers).get_json()
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    with backend.db_cursor() as (conn, cursor):
+        full = summarize(*load_histograms(cursor, SCAN_SQL))
+    full = json.loads(json.dumps(full))
+
+    consistent = close_enough(incremental, full)
+    print(json.dumps({
+        "rows": args.rows,
+        "ops": args.ops,
+        "analytics_ms": round(latency_ms, 2),
+        "consistent": consistent,
+    }))
+    if not consistent:
+        print(json.dumps({"incremental": incremental, "full": full}, indent=2), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Shared helpers for the backend benchmarks.
+
+The benchmarks import `backend/app.py` directly and drive it through the
+Flask test client, so they need the same MYSQL_* environment as the app.
+Seeding deletes every employee first, so it only runs when
+BENCH_WIPE_DATABASE names the database MYSQL_* points at; use a
+throwaway MySQL, never one holding real data.
+"""
+import os
+import random
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+ROLES = (
+    "Azure Cloud Developer", "GCP Architect", "AWS Associate",
+    "Data Engineer", "QA Analyst", "Site Reliability Engineer",
+)
+SEED_BATCH = 5000
+
+
+def load_app():
+    import app as backend
+
+    # Benchmarks hammer the API far past the default per-IP limits.
+    backend.limiter.enabled = False
+    return backend
+
+
+def auth_header(backend, username="admin"):
+    from flask_jwt_extended import create_access_token
+
+    with backend.app.app_context():
+        token = create_access_token(identity=username)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def synthetic_employee(i, rng=random):
+    return (
+        f"Employee {i:07d}",
+        rng.choice(ROLES),
+        rng.randint(0, 100),
+        "Synthetic benchmark row",
+        round(rng.uniform(0, 5), 1),
+    )
+
+
+def seed_employees(backend, rows, seed=42):
+    """Replace the productivity table with `rows` synthetic employees."""
+    database = backend.db_config["database"]
+    if os.getenv("BENCH_WIPE_DATABASE") != database:
+        sys.exit(
+            f"Refusing to wipe {database!r} on {backend.db_config['host']!r}: seeding deletes "
+            f"every employee. Point MYSQL_* at a throwaway database and set "
+            f"BENCH_WIPE_DATABASE={database} to confirm."
+        )
+    rng = random.Random(seed)
+    with backend.db_cursor() as (conn, cursor):
+        cursor.execute("DELETE FROM productivity")
+        for start in range(0, rows, SEED_BATCH):
+            batch = [synthetic_employee(i, rng) for i in range(start, min(start + SEED_BATCH, rows))]
+            cursor.executemany("""
+                INSERT INTO productivity (name, role, productivity, feedback, rating)
+                VALUES (%s, %s, %s, %s, %s)
+            """, batch)
+            conn.commit()
+        # Raw inserts bypass the API write paths, so resync the analytics
+        # summaries and move the data version past any cached reports
+        backend.rebuild_summaries(cursor)
+        backend.bump_data_version(cursor)
+        conn.commit()
+
+
+def peak_rss_mb():
+    import resource
+
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
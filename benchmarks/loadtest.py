@@ -0,0 +1,162 @@
+"""Concurrent load test of the Flask API with per-endpoint latency and memory.
+
+Usage:
+    # throwaway MySQL stand-in with the schema from database/init.sql
+    docker compose up -d db
+    MYSQL_HOST=127.0.0.1 BENCH_WIPE_DATABASE=employee_db \\
+        python benchmarks/loadtest.py --rows 10000 100000 \\
+        --concurrency 8 --output bench_output.json
+
+For every row count the table is seeded with synthetic employees, then each
+scenario runs in its own subprocess: --concurrency threads, each with its
+own test client, call the endpoint --requests times in total. Running the
+app in-process is how a gthread worker serves it, minus the socket, and a
+fresh process per scenario makes ru_maxrss a per-endpoint peak.
+
+Output is one JSON document with p50/p95/p99 latency, requests/sec, error
+count and peak RSS for each endpoint at each table size.
+"""
+import argparse
+import json
+import math
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import ROLES, auth_header, load_app, peak_rss_mb, seed_employees, synthetic_employee
+
+COLUMNS = ("name", "role", "productivity", "feedback", "rating")
+
+
+def employee(rng):
+    return dict(zip(COLUMNS, synthetic_employee(rng.randint(0, 10 ** 6), rng)))
+
+
+def id_range(backend):
+    with backend.db_cursor() as (conn, cursor):
+        cursor.execute("SELECT MIN(id), MAX(id) FROM productivity")
+        low, high = cursor.fetchone()
+    return low or 0, high or 0
+
+
+# Each scenario maps (rng, context) to the (method, path, options) of one request.
+SCENARIOS = {
+    "login": lambda rng, ctx: ("POST", "/login", {"json": {"username": "admin", "password": "admin123"}}),
+    "list_first_page": lambda rng, ctx: ("GET", "/employees?limit=100", {}),
+    "list_deep_page": lambda rng, ctx: (
+        "GET", f"/employees?limit=100&after={rng.randint(ctx['low'], ctx['high'])}", {}),
+    "list_filtered": lambda rng, ctx: (
+        "GET", f"/employees?limit=100&role={rng.choice(ROLES)}&min_productivity={rng.randint(0, 90)}", {}),
+    "add": lambda rng, ctx: ("POST", "/add", {"json": employee(rng)}),
+    "update": lambda rng, ctx: (
+        "PUT", f"/employee/{rng.randint(ctx['low'], ctx['high'])}",
+        {"json": {k: v for k, v in employee(rng).items() if k != "productivity"}}),
+    "delete": lambda rng, ctx: (
+        "DELETE", f"/employee/{ctx['delete_ids'].pop() if ctx['delete_ids'] else 0}", {}),
+    "analytics": lambda rng, ctx: ("GET", "/analytics", {}),
+    "export_csv": lambda rng, ctx: ("GET", "/export/csv", {}),
+    "export_pdf": lambda rng, ctx: ("GET", "/export/pdf", {}),
+}
+# Full-table exports are far heavier than everything else, so unless
+# --requests is given they run fewer times
+DEFAULT_REQUESTS = {"export_csv": 10, "export_pdf": 10}
+DEFAULT_REQUESTS_PER_SCENARIO = 500
+
+
+def percentile(samples, p):
+    if not samples:
+        return None
+    return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def run_scenario(name, requests, concurrency, seed):
+    backend = load_app()
+    headers = auth_header(backend)
+    low, high = id_range(backend)
+    ctx = {"low": low, "high": high, "delete_ids": list(range(high, max(low, high - requests) - 1, -1))}
+    ctx_lock = threading.Lock()
+    local = threading.local()
+    build = SCENARIOS[name]
+
+    def one_request(i):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = backend.app.test_client()
+        rng = random.Random(seed * 100003 + i)
+        with ctx_lock:
+            method, path, options = build(rng, ctx)
+        start = time.perf_counter()
+        response = client.open(path, method=method, headers=headers, buffered=False, **options)
+        size = sum(len(chunk) for chunk in response.iter_encoded())
+        response.close()
+        return time.perf_counter() - start, response.status_code, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one_request, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    return {
+        "endpoint": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for r in results if r[1] >= 400),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "avg_response_bytes": round(sum(r[2] for r in results) / requests),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--requests", type=int,
+                        help=f"requests per scenario (default {DEFAULT_REQUESTS_PER_SCENARIO}, "
+                             f"exports {DEFAULT_REQUESTS['export_csv']})")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--skip-seed", action="store_true", help="benchmark the table as it is")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        # Always given --requests by the parent run
+        print(json.dumps(run_scenario(args.scenario, args.requests, args.concurrency, args.seed)))
+        return
+
+    backend = load_app()
+    report = {"concurrency": args.concurrency, "runs": []}
+    for rows in args.rows:
+        if not args.skip_seed:
+            seed_employees(backend, rows)
+        results = []
+        for name in args.scenarios:
+            requests = args.requests or DEFAULT_REQUESTS.get(name, DEFAULT_REQUESTS_PER_SCENARIO)
+            out = subprocess.run(
+                [sys.executable, __file__, "--scenario", name,
+                 "--requests", str(requests), "--concurrency", str(args.concurrency),
+                 "--seed", str(args.seed)],
+                check=True, capture_output=True, text=True
+            ).stdout.strip().splitlines()[-1]
+            results.append(json.loads(out))
+            print(json.dumps({"rows": rows, **results[-1]}), file=sys.stderr)
+        report["runs"].append({"rows": rows, "results": results})
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
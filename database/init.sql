@@ -9,7 +9,20 @@ CREATE TABLE IF NOT EXISTS productivity (
     feedback TEXT,
     rating FLOAT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    -- Listings are keyset-paginated on id. A role filter is an equality
+    -- seek on (role, id), already in id order, so every page stays a short
+    -- index range. A name prefix or productivity/rating range can't keep
+    -- id order: MySQL either reads the matching range from idx_name /
+    -- idx_productivity / idx_rating and sorts it, or walks the primary key
+    -- and filters, so those pages cost more as the match set grows.
+    -- (InnoDB appends id to every secondary index on its own.)
+    INDEX idx_role_id (role, id),
+    INDEX idx_name (name),
+    INDEX idx_productivity (productivity),
+    INDEX idx_rating (rating),
+    -- Top/bottom-N per role walks this instead of sorting the table
+    INDEX idx_role_productivity_id (role, productivity, id)
 );
 
 INSERT INTO productivity (name, role, productivity) VALUES
@@ -17,6 +30,41 @@ INSERT INTO productivity (name, role, productivity) VALUES
 ('Sanjay', 'GCP Architect', 90),
 ('Chandu', 'AWS Associate', 80);
 
+-- Per-role histograms behind /analytics, maintained by the API write paths
+CREATE TABLE IF NOT EXISTS role_productivity_hist (
+    role VARCHAR(100) NOT NULL,
+    productivity INT NOT NULL,
+    employees INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (role, productivity)
+);
+
+CREATE TABLE IF NOT EXISTS role_rating_hist (
+    role VARCHAR(100) NOT NULL,
+    rating_bucket TINYINT NOT NULL, -- FLOOR(rating) clamped to 0-5, -1 = unrated
+    employees INT NOT NULL DEFAULT 0,
+    rating_sum DOUBLE NOT NULL DEFAULT 0,
+    PRIMARY KEY (role, rating_bucket)
+);
+
+INSERT INTO role_productivity_hist (role, productivity, employees)
+SELECT COALESCE(role, ''), COALESCE(productivity, 0), COUNT(*)
+FROM productivity GROUP BY 1, 2;
+
+INSERT INTO role_rating_hist (role, rating_bucket, employees, rating_sum)
+SELECT COALESCE(role, ''), IF(rating IS NULL, -1, LEAST(5, GREATEST(0, FLOOR(rating)))),
+       COUNT(*), COALESCE(SUM(rating), 0)
+FROM productivity GROUP BY 1, 2;
+
+-- Bumped in the same transaction as every write to productivity, so
+-- (version, updated_at) identifies a table snapshot for report caching
+CREATE TABLE IF NOT EXISTS data_version (
+    name VARCHAR(32) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+);
+
+INSERT INTO data_version (name) VALUES ('productivity');
+
 CREATE TABLE IF NOT EXISTS admins (
     id INT AUTO_INCREMENT PRIMARY KEY,
     username VARCHAR(50) UNIQUE,
@@ -25,4 +73,11 @@ CREATE TABLE IF NOT EXISTS admins (
 
 -- password = admin123 (pbkdf2_sha256)
 INSERT INTO admins (username, password_hash)
-VALUES ('admin', '$pbkdf2-sha256$29000$o3RujTFmrFUKAaCUkvKeEw$xn0DI55/qRI44qV/79Zd0MDuhjW/Cp0nUumdmvsQ7LY');
\ No newline at end of file
+VALUES ('admin', '$pbkdf2-sha256$29000$o3RujTFmrFUKAaCUkvKeEw$xn0DI55/qRI44qV/79Zd0MDuhjW/Cp0nUumdmvsQ7LY');
+
+-- Revoked JWTs for BLOCKLIST_BACKEND=sql; rows are useless after expires_at
+CREATE TABLE IF NOT EXISTS token_blocklist (
+    jti VARCHAR(64) PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    INDEX idx_expires_at (expires_at)
+);
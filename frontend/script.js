@@ -63,28 +63,11 @@ async function addEmployee() {
   }
 }
 
-async function loadEmployees() {
-  try {
-    const res = await fetch(`${backendURL}/employees`, {
-      headers: { "Authorization": `Bearer ${token}` }
-    });
+const PAGE_SIZE = 100;
+let nextCursor = null;
 
-    if (res.status === 401) {
-      // token expired or invalid
-      localStorage.removeItem("token");
-      token = "";
-      document.getElementById("employee-section").style.display = "none";
-      document.getElementById("login-section").style.display = "block";
-      alert("Session expired. Please login again.");
-      return;
-    }
-
-    const data = await res.json();
-    const table = document.getElementById("employee-table");
-    table.innerHTML = "";
-
-    data.employees.forEach(emp => {
-      table.innerHTML += `
+function renderEmployeeRow(emp) {
+  return `
         <tr>
           <td>${emp.id}</td>
           <td><input value="${emp.name}" id="name-${emp.id}"></td>
@@ -101,7 +84,44 @@ async function loadEmployees() {
           </td>
         </tr>
       `;
+}
+
+// Reload the table from the first page
+async function loadEmployees() {
+  nextCursor = null;
+  document.getElementById("employee-table").innerHTML = "";
+  await loadMoreEmployees();
+}
+
+// Fetch the page after `nextCursor` and append it to the table
+async function loadMoreEmployees() {
+  const params = new URLSearchParams({ limit: PAGE_SIZE });
+  if (nextCursor !== null) params.set("after", nextCursor);
+
+  try {
+    // "no-cache" revalidates with the stored ETag, so unchanged pages
+    // come back as a bodiless 304 served from the browser cache
+    const res = await fetch(`${backendURL}/employees?${params}`, {
+      cache: "no-cache",
+      headers: { "Authorization": `Bearer ${token}` }
     });
+
+    if (res.status === 401) {
+      // token expired or invalid
+      localStorage.removeItem("token");
+      token = "";
+      document.getElementById("employee-section").style.display = "none";
+      document.getElementById("login-section").style.display = "block";
+      alert("Session expired. Please login again.");
+      return;
+    }
+
+    const data = await res.json();
+    const table = document.getElementById("employee-table");
+    table.insertAdjacentHTML("beforeend", data.employees.map(renderEmployeeRow).join(""));
+
+    nextCursor = data.next_cursor;
+    document.getElementById("load-more-btn").style.display = nextCursor === null ? "none" : "inline-flex";
   } catch (err) {
     alert("Failed to load employees");
     console.error(err);
@@ -154,21 +174,48 @@ async function deleteEmployee(id) {
   }
 }
 
+const REPORT_POLL_MS = 1000;
+
+function saveBlob(blob, filename) {
+  const url = window.URL.createObjectURL(blob);
+  const a = document.createElement("a");
+  a.href = url;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
+}
+
+// Queue a report job, poll until it is rendered, then download it
+async function downloadReport(format, filename) {
+  const headers = {
+    "Authorization": `Bearer ${token}`,
+    "Content-Type": "application/json"
+  };
+  let res = await fetch(`${backendURL}/reports`, {
+    method: "POST",
+    headers,
+    body: JSON.stringify({ format })
+  });
+  let job = await res.json();
+  if (!res.ok) throw new Error(job.msg || "Failed to queue report");
+
+  while (job.status === "queued" || job.status === "running") {
+    await new Promise(resolve => setTimeout(resolve, REPORT_POLL_MS));
+    res = await fetch(`${backendURL}/reports/${job.id}`, { headers });
+    job = await res.json();
+    if (!res.ok) throw new Error(job.msg || "Failed to check report");
+  }
+  if (job.status !== "done") throw new Error(job.error || "Report failed");
+
+  res = await fetch(`${backendURL}${job.download_url}`, { headers });
+  if (!res.ok) throw new Error("Failed to download report");
+  saveBlob(await res.blob(), filename);
+}
+
 async function downloadPDF() {
   try {
-    const res = await fetch(`${backendURL}/export/pdf`, {
-      method: "GET",
-      headers: { "Authorization": `Bearer ${token}` }
-    });
-    if (!res.ok) throw new Error("Failed to download PDF");
-    const blob = await res.blob();
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement("a");
-    a.href = url;
-    a.download = "employee_report.pdf";
-    document.body.appendChild(a);
-    a.click();
-    a.remove();
+    await downloadReport("pdf", "employee_report.pdf");
   } catch (err) {
     alert("Error downloading PDF");
     console.error(err);
@@ -179,17 +226,11 @@ async function downloadCSV() {
   try {
     const res = await fetch(`${backendURL}/export/csv`, {
       method: "GET",
+      cache: "no-cache",
       headers: { "Authorization": `Bearer ${token}` }
     });
     if (!res.ok) throw new Error("Failed to download CSV");
-    const blob = await res.blob();
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement("a");
-    a.href = url;
-    a.download = "employee_report.csv";
-    document.body.appendChild(a);
-    a.click();
-    a.remove();
+    saveBlob(await res.blob(), "employee_report.csv");
   } catch (err) {
     alert("Error downloading CSV");
     console.error(err);
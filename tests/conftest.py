@@ -0,0 +1,25 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+
+class NoDatabasePool:
+    """Stands in for the MySQL pool so app.py imports without a server."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_connection(self):
+        raise RuntimeError("this test has no database")
+
+
+@pytest.fixture(scope="session")
+def backend():
+    """The app module, for tests of code paths that never query MySQL."""
+    with mock.patch("db.InstrumentedPool", NoDatabasePool):
+        import app
+    return app
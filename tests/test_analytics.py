@@ -0,0 +1,181 @@
+"""Incremental /analytics summaries against a direct recomputation."""
+import math
+import random
+import struct
+from collections import Counter
+
+import pytest
+
+from analytics import (
+    SUMMARY_SQL, apply_summary_delta, bulk_update_delta, histogram_stats, load_histograms,
+    normalize_rating, rating_bucket, summarize,
+)
+
+ROLES = ["Engineer", "Designer", "Manager", None]
+
+
+class FakeCursor:
+    """Just enough of a DB-API cursor for the summary upserts and reads."""
+
+    def __init__(self):
+        self.productivity = Counter()
+        self.rating = Counter()
+        self.rating_sum = Counter()
+        self._rows = []
+
+    def executemany(self, sql, rows):
+        if "role_productivity_hist" in sql:
+            for role, productivity, n in rows:
+                self.productivity[(role, productivity)] += n
+        elif "role_rating_hist" in sql:
+            for role, bucket, n, total in rows:
+                self.rating[(role, bucket)] += n
+                self.rating_sum[(role, bucket)] += total
+        else:
+            raise AssertionError(sql)
+
+    def execute(self, sql, params=None):
+        if sql == SUMMARY_SQL["productivity"]:
+            self._rows = [(r, p, n) for (r, p), n in self.productivity.items() if n > 0]
+        elif sql == SUMMARY_SQL["rating"]:
+            self._rows = [
+                (r, b, n, self.rating_sum[(r, b)]) for (r, b), n in self.rating.items() if n > 0
+            ]
+        else:
+            raise AssertionError(sql)
+
+    def fetchall(self):
+        return self._rows
+
+
+def recompute(table):
+    """What SCAN_SQL's GROUP BY returns for `table` (id -> role, productivity, rating)."""
+    productivity, rating, rating_sum = Counter(), Counter(), Counter()
+    for role, prod, rate in table.values():
+        productivity[(role or "", prod or 0)] += 1
+        rating[(role or "", rating_bucket(rate))] += 1
+        rating_sum[(role or "", rating_bucket(rate))] += rate or 0
+    return (
+        [(r, p, n) for (r, p), n in productivity.items()],
+        [(r, b, n, rating_sum[(r, b)]) for (r, b), n in rating.items()],
+    )
+
+
+def assert_same(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for k in a:
+            assert_same(a[k], b[k])
+    elif isinstance(a, list):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_same(x, y)
+    elif isinstance(a, float) or isinstance(b, float):
+        assert a == pytest.approx(b, abs=0.011)
+    else:
+        assert a == b
+
+
+def random_employee(rng):
+    """A row as the API writes it, from a rating as a client might send it."""
+    rating = rng.choice([
+        None, round(rng.uniform(0, 5), 1), rng.uniform(0, 5),
+        # Rounds up to the next whole star once stored as a 32-bit FLOAT
+        rng.randint(1, 5) - 1e-8,
+    ])
+    return rng.choice(ROLES), rng.randint(0, 100), normalize_rating(rating)
+
+
+def as_stored(row):
+    """`row` as read back from the productivity table's FLOAT rating column."""
+    role, productivity, rating = row
+    if rating is not None:
+        rating = struct.unpack("f", struct.pack("f", rating))[0]
+    return role, productivity, rating
+
+
+def test_normalize_rating_matches_stored_bucket():
+    assert normalize_rating(None) is None
+    assert normalize_rating(4) == 4.0
+    for rating in (2.99999999, 0.9999999999, 4.995, 3.14159):
+        stored = as_stored((None, 0, normalize_rating(rating)))[2]
+        assert rating_bucket(normalize_rating(rating)) == rating_bucket(stored)
+
+
+def test_histogram_stats_matches_sorted_list():
+    rng = random.Random(1)
+    values = [rng.randint(0, 100) for _ in range(501)]
+    ratings = [rng.choice([None, round(rng.uniform(0, 5), 1)]) for _ in values]
+
+    stats = histogram_stats(
+        Counter(values), Counter(rating_bucket(r) for r in ratings),
+        sum(r for r in ratings if r is not None),
+    )
+
+    ordered = sorted(values)
+    rated = [r for r in ratings if r is not None]
+    assert stats["employees"] == len(values)
+    assert stats["avg_productivity"] == round(sum(values) / len(values), 2)
+    for p in (50, 90, 99):
+        assert stats["percentiles"][f"p{p}"] == ordered[math.ceil(p / 100 * len(values)) - 1]
+    assert stats["avg_rating"] == round(sum(rated) / len(rated), 2)
+    assert stats["rating_distribution"]["unrated"] == len(values) - len(rated)
+    assert sum(stats["rating_distribution"].values()) == len(values)
+
+
+def test_summarize_empty():
+    summary = summarize([], [])
+    assert summary["roles"] == []
+    assert summary["overall"]["employees"] == 0
+    assert summary["overall"]["avg_productivity"] is None
+    assert summary["overall"]["avg_rating"] is None
+
+
+def test_incremental_summaries_match_recomputation():
+    rng = random.Random(7)
+    cursor = FakeCursor()
+    table = {}
+    next_id = 1
+
+    def add(count):
+        nonlocal next_id
+        rows = []
+        for _ in range(count):
+            rows.append(random_employee(rng))
+            table[next_id] = as_stored(rows[-1])
+            next_id += 1
+        apply_summary_delta(cursor, added=rows)
+
+    add(200)
+    for _ in range(500):
+        op = rng.random()
+        if op < 0.2:
+            add(rng.randint(1, 20))
+        elif op < 0.45:
+            emp_id = rng.choice(list(table))
+            old = table[emp_id]
+            role, _, rating = random_employee(rng)
+            table[emp_id] = as_stored((role, old[1], rating))
+            apply_summary_delta(cursor, removed=[old], added=[(role, old[1], rating)])
+        elif op < 0.6:
+            victims = rng.sample(list(table), min(len(table), rng.randint(1, 10)))
+            apply_summary_delta(cursor, removed=[table.pop(i) for i in victims])
+        else:
+            # Bulk update chunk with repeated ids and one id that doesn't exist
+            targets = rng.sample(list(table), min(len(table), 10))
+            targets += rng.choices(targets, k=5) + [next_id + 1000]
+            chunk = []
+            for emp_id in targets:
+                role, _, rating = random_employee(rng)
+                chunk.append(("name", role, "feedback", rating, emp_id))
+            old = {i: table[i] for i in sorted(set(targets)) if i in table}
+            for _, role, _, rating, emp_id in chunk:
+                if emp_id in table:
+                    table[emp_id] = as_stored((role, table[emp_id][1], rating))
+            removed, added = bulk_update_delta(chunk, old)
+            apply_summary_delta(cursor, removed=removed, added=added)
+
+        if not table:
+            add(10)
+
+    assert_same(summarize(*load_histograms(cursor)), summarize(*recompute(table)))
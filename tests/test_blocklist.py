@@ -0,0 +1,53 @@
+"""In-process token blocklist: lookups and expiry pruning."""
+import pytest
+
+import blocklist
+from blocklist import MemoryBlocklist, make_blocklist
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(blocklist.time, "time", lambda: now[0])
+    return now
+
+
+def test_contains_until_expiry(clock):
+    store = MemoryBlocklist()
+    store.add("a", 1010)
+    assert store.contains("a")
+    assert not store.contains("b")
+
+    clock[0] = 1010
+    assert not store.contains("a")
+
+
+def test_add_prunes_expired_tokens(clock):
+    store = MemoryBlocklist()
+    for i in range(5):
+        store.add(f"old{i}", 1000 + i + 1)
+    store.add("long", 2000)
+    assert len(store) == 6
+
+    clock[0] = 1003
+    store.add("new", 1500)
+    # old0..old2 expired at or before 1003
+    assert len(store) == 4
+    assert not store.contains("old1")
+    assert store.contains("old4")
+
+
+def test_re_adding_keeps_the_later_expiry(clock):
+    store = MemoryBlocklist()
+    store.add("a", 1005)
+    store.add("a", 1100)
+
+    clock[0] = 1050
+    store.add("b", 1200)  # prunes the stale (1005, "a") heap entry
+    assert store.contains("a")
+    assert len(store) == 2
+
+
+def test_make_blocklist_defaults_to_memory():
+    assert isinstance(make_blocklist("memory"), MemoryBlocklist)
+    assert isinstance(make_blocklist("unknown"), MemoryBlocklist)
@@ -0,0 +1,56 @@
+"""Bulk endpoint helpers: request body parsing and the batched UPDATE."""
+from io import BytesIO
+
+import pytest
+
+CSV = (
+    "name,role,productivity,feedback,rating\r\n"
+    "Asha,QA Analyst,80,\"Steady, reliable\",4.5\r\n"
+    "Ben,Data Engineer,,,\r\n"
+    "Caro,GCP Architect,lots,,\r\n"
+).encode("utf-8")
+
+EXPECTED = [
+    {"name": "Asha", "role": "QA Analyst", "productivity": 80, "feedback": "Steady, reliable", "rating": 4.5},
+    {"name": "Ben", "role": "Data Engineer"},
+    {"name": "Caro", "role": "GCP Architect", "productivity": "lots"},
+]
+
+
+def read_rows(backend, **request_args):
+    with backend.app.test_request_context("/employees/bulk", method="POST", **request_args):
+        return list(backend.read_bulk_rows())
+
+
+def test_multipart_csv_upload(backend):
+    rows = read_rows(backend, data={"file": (BytesIO(CSV), "employees.csv")},
+                     content_type="multipart/form-data")
+    assert rows == EXPECTED
+
+
+def test_csv_body(backend):
+    assert read_rows(backend, data=CSV, content_type="text/csv") == EXPECTED
+
+
+def test_json_array(backend):
+    assert read_rows(backend, json=[{"name": "Asha"}]) == [{"name": "Asha"}]
+
+
+def test_rejects_other_bodies(backend):
+    with pytest.raises(ValueError):
+        read_rows(backend, json={"name": "Asha"})
+
+
+def test_bulk_update_statement(backend):
+    sql, params = backend.bulk_update_statement([
+        ("Asha", "QA Analyst", None, 4.5, 3),
+        ("Ben", "Data Engineer", "ok", None, 7),
+    ])
+    assert sql.count("%s") == len(params)
+    assert params == [
+        3, "Asha", 7, "Ben",
+        3, "QA Analyst", 7, "Data Engineer",
+        3, None, 7, "ok",
+        3, 4.5, 7, None,
+        3, 7,
+    ]
@@ -0,0 +1,70 @@
+"""In-process response cache: TTL, entry/byte eviction and counters."""
+import pytest
+
+import cache
+from cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hits_misses_and_ttl(clock):
+    events = []
+    lru = LRUCache(ttl=10, on_event=events.append)
+    assert lru.get("a") is None
+    lru.set("a", "body")
+    assert lru.get("a") == "body"
+
+    clock[0] += 10.5
+    assert lru.get("a") is None
+    assert lru.stats()["entries"] == 0
+    assert events == ["misses", "hits", "expirations", "misses"]
+    assert lru.stats() == {
+        "hits": 1, "misses": 2, "evictions": 0, "expirations": 1,
+        "entries": 0, "bytes": 0, "backend": "memory",
+    }
+
+
+def test_per_entry_ttl_and_no_expiry(clock):
+    lru = LRUCache(ttl=10)
+    lru.set("short", "x", ttl=1)
+    lru.set("forever", "y", ttl=0)
+    clock[0] += 1000
+    assert lru.get("short") is None
+    assert lru.get("forever") == "y"
+
+
+def test_evicts_least_recently_used_by_entries(clock):
+    lru = LRUCache(max_entries=2)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    lru.get("a")
+    lru.set("c", "3")
+    assert lru.get("b") is None
+    assert lru.get("a") == "1" and lru.get("c") == "3"
+    assert lru.stats()["evictions"] == 1
+
+
+def test_evicts_by_bytes(clock):
+    lru = LRUCache(max_bytes=10)
+    lru.set("a", "x" * 6)
+    lru.set("b", "y" * 6)
+    assert lru.get("a") is None
+    assert lru.stats()["bytes"] == 6
+
+    # Larger than the whole cache: not stored, nothing evicted
+    lru.set("huge", "z" * 11)
+    assert lru.get("huge") is None
+    assert lru.get("b") == "y" * 6
+
+
+def test_overwrite_replaces_size(clock):
+    lru = LRUCache()
+    lru.set("a", "x" * 100)
+    lru.set("a", "x" * 10)
+    assert lru.stats()["bytes"] == 10
+    assert lru.stats()["entries"] == 1
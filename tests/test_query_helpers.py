@@ -0,0 +1,15 @@
+"""Query-string parsing shared by the listing endpoints."""
+import pytest
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (None, 100), ("", 100), ("0", 1), ("-1", 1), ("1", 1), ("250", 250), ("5000", 1000),
+])
+def test_parse_limit(backend, raw, expected):
+    args = {} if raw is None else {"limit": raw}
+    assert backend.parse_limit(args, "limit", 100, 1000) == expected
+
+
+def test_parse_limit_rejects_non_numbers(backend):
+    with pytest.raises(ValueError):
+        backend.parse_limit({"limit": "ten"}, "limit", 100, 1000)
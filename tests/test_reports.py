@@ -0,0 +1,43 @@
+"""Report job state shared between workers through REPORT_DIR."""
+import time
+
+import pytest
+
+
+@pytest.fixture
+def reports(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, "REPORT_DIR", str(tmp_path))
+    return backend
+
+
+def job(status, created_at=None, **extra):
+    return {"id": "a" * 32, "format": "pdf", "status": status, "error": None,
+            "created_at": time.time() if created_at is None else created_at, **extra}
+
+
+def test_unknown_and_malformed_ids(reports):
+    assert reports.load_report("a" * 32) is None
+    assert reports.load_report("../../etc/passwd") is None
+
+
+def test_done_needs_the_artifact(reports):
+    reports.save_report_state(job("done"))
+    assert reports.load_report("a" * 32) is None
+
+    open(reports.report_path(job("done")), "wb").close()
+    assert reports.load_report("a" * 32)["status"] == "done"
+
+
+def test_artifact_marks_running_job_done(reports):
+    reports.save_report_state(job("running"))
+    assert reports.load_report("a" * 32)["status"] == "running"
+
+    open(reports.report_path(job("running")), "wb").close()
+    assert reports.load_report("a" * 32)["status"] == "done"
+
+
+def test_stale_running_job_fails(reports):
+    reports.save_report_state(job("running", created_at=time.time() - reports.REPORT_TIMEOUT - 1))
+    loaded = reports.load_report("a" * 32)
+    assert loaded["status"] == "failed"
+    assert loaded["error"] == "Report timed out"